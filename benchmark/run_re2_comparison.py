@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""Run the comprehensive Odin RE2 vs Rust regex benchmark comparison.
+
+Compiles benchmark/re2_comprehensive_benchmark.odin and the Rust reference
+benchmark (benchmark/re2_performance_comparison.rs), runs both executables,
+parses their output and writes a markdown comparison report plus the raw
+logs under benchmark/results/.
+
+Usage:
+    python benchmark/run_re2_comparison.py
+    python benchmark/run_re2_comparison.py --parallel-run
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from statistics import mean, pstdev
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+_PARSE_RE = re.compile(
+    rb"^\s*(Test|Pattern|Compile|Match|Result|Throughput):\s*(.*?)\s*$",
+    re.MULTILINE,
+)
+
+_CARGO_TOML = """[package]
+name = "re2_performance_comparison"
+version = "0.1.0"
+edition = "2021"
+
+[[bin]]
+name = "re2_performance_comparison"
+path = "re2_performance_comparison.rs"
+
+[dependencies]
+regex = "1"
+serde_json = "1"
+chrono = "0.4"
+
+[profile.release]
+opt-level = 3
+lto = true
+"""
+
+_REPORT_TEMPLATE = """# Odin RE2 vs Rust regex Benchmark Comparison
+
+Generated: {run_human}
+Platform: {platform}
+Python: {py_version}
+
+## Summary
+
+- Odin benchmark tests: {odin_count}
+- Rust benchmark tests: {rust_count}
+- Compared tests: {compared}
+- Odin throughput: mean {odin_tp_mean:.2f} MB/s (pstdev {odin_tp_stdev:.2f})
+- Rust throughput: mean {rust_tp_mean:.2f} MB/s (pstdev {rust_tp_stdev:.2f})
+
+## Results
+
+| Test | Odin compile | Odin match | Odin throughput | Rust throughput |
+|------|--------------|------------|-----------------|-----------------|
+{rows}
+"""
+
+_EXE = ".exe" if sys.platform == "win32" else ""
+
+_FIELD_MAP = {
+    "Pattern": "pattern",
+    "Compile": "compile_time",
+    "Match": "match_time",
+    "Result": "result",
+    "Throughput": "throughput",
+}
+
+
+def _dir_files(path):
+    """Entry names from one scandir sweep; empty set for a missing directory."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+class BenchmarkRunner:
+    """Orchestrates compiling and running both benchmark executables."""
+
+    # Stage-specific timeouts (seconds): a hung odin build should fail fast,
+    # while a cold cargo release build or a long benchmark run needs headroom.
+    _odin_build_timeout = 120
+    _cargo_build_timeout = 600
+    _benchmark_timeout = 900
+    _term_grace = 5
+
+    def __init__(self):
+        self.benchmark_dir = Path(__file__).resolve().parent
+        self.results_dir = self.benchmark_dir / "results"
+        self.results_dir.mkdir(exist_ok=True)
+        self.odin_source = self.benchmark_dir / "re2_comprehensive_benchmark.odin"
+        self.rust_source = self.benchmark_dir / "re2_performance_comparison.rs"
+        self.compile_cache_file = self.results_dir / ".compile_cache.json"
+        self._compile_cache_lock = threading.Lock()
+        # Fixed target dir so cargo's artifact cache survives across runs and
+        # machines that wipe the default target/ location.
+        self.cargo_target_dir = self.benchmark_dir / ".cargo-target"
+        # One timestamp per run: result files and the report stay correlated
+        # instead of each call site stamping its own time.
+        self.run_id = time.strftime("%Y%m%d_%H%M%S")
+        self.run_human = time.strftime("%Y-%m-%d %H:%M:%S")
+        # Discovered during compile (or from the compile cache); when set,
+        # run_*_benchmark needs no filesystem probing at all.
+        self.odin_binary = None
+        self.rust_binary = None
+
+    def run_command(self, cmd, cwd=None, stdout_path=None, timeout=300, env=None):
+        """Run a child process; with stdout_path, its stdout streams to disk.
+
+        Streaming avoids buffering multi-MB benchmark logs in a Python str
+        only to immediately rewrite them to a file. Each stage passes its
+        own timeout; on expiry the child gets SIGTERM and, after a short
+        grace period, SIGKILL, and a failed CompletedProcess is returned.
+        """
+        print(f"Running: {' '.join(str(part) for part in cmd)}")
+        stdout_file = open(stdout_path, "wb") if stdout_path is not None else None
+        try:
+            # close_fds=False lets CPython spawn the child via posix_spawn, so
+            # child startup stays constant-time instead of scaling with parent
+            # RSS.
+            proc = subprocess.Popen(
+                cmd,
+                cwd=cwd or self.benchmark_dir,
+                stdout=stdout_file if stdout_file is not None else subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                close_fds=False,
+                env=env,
+            )
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.terminate()
+                try:
+                    stdout, stderr = proc.communicate(timeout=self._term_grace)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    stdout, stderr = proc.communicate()
+                print(f"Command timed out after {timeout}s: {cmd[0]}")
+                returncode = proc.returncode if proc.returncode is not None else 124
+                return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+            return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+        finally:
+            if stdout_file is not None:
+                stdout_file.close()
+
+    def _toolchain_version(self, cmd):
+        try:
+            return subprocess.run(
+                cmd, capture_output=True, text=True, close_fds=False
+            ).stdout
+        except OSError:
+            return ""
+
+    def _compile_cache_key(self, *parts):
+        """Content hash over source files/strings plus the toolchain banner."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            data = part.read_bytes() if isinstance(part, Path) else part.encode()
+            digest.update(data)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_compile_cache(self):
+        try:
+            return json.loads(self.compile_cache_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _cached_binary(self, key):
+        """Binary recorded for key, or None if it was rebuilt or removed since.
+
+        Both compile steps reuse one output path, so a bare existence check
+        would accept whatever build last landed there; the stored mtime ties
+        the cache hit to the exact build the key was computed for.
+        """
+        entry = self._load_compile_cache().get(key)
+        if not isinstance(entry, dict):
+            return None
+        path = Path(entry.get("path", ""))
+        try:
+            if path.stat().st_mtime_ns == entry.get("mtime_ns"):
+                return path
+        except OSError:
+            pass
+        return None
+
+    def _store_compile_cache(self, key, binary):
+        # The Odin and Rust compiles run concurrently and both store on
+        # success; serialize the read-modify-write so neither entry is lost.
+        with self._compile_cache_lock:
+            cache = self._load_compile_cache()
+            cache[key] = {
+                "path": str(binary),
+                "mtime_ns": binary.stat().st_mtime_ns,
+            }
+            self.compile_cache_file.write_text(json.dumps(cache), encoding="utf-8")
+
+    def create_cargo_toml(self):
+        cargo_toml = self.benchmark_dir / "Cargo.toml"
+        content = _CARGO_TOML.encode("utf-8")
+        try:
+            # Leaving an identical file untouched preserves its mtime, which
+            # cargo folds into its rebuild fingerprint; a spurious write would
+            # force a full rebuild. A differing file is stale and overwritten.
+            if cargo_toml.read_bytes() == content:
+                return
+        except OSError:
+            pass
+        cargo_toml.write_bytes(content)
+
+    def compile_odin_benchmark(self):
+        output = self.benchmark_dir / f"re2_odin_benchmark{_EXE}"
+        try:
+            key = self._compile_cache_key(
+                self.odin_source, self._toolchain_version(["odin", "version"])
+            )
+        except OSError:
+            # Source unreadable; let the build report it instead.
+            key = None
+        cached = self._cached_binary(key) if key else None
+        if cached is not None:
+            print("Odin benchmark binary up to date, skipping build")
+            self.odin_binary = cached
+            return True
+        result = self.run_command(
+            [
+                "odin", "build", str(self.odin_source), "-file", "-o:speed",
+                f"-out:{output}",
+            ],
+            timeout=self._odin_build_timeout,
+        )
+        if result.returncode != 0:
+            print("Odin benchmark build failed:")
+            print(result.stderr)
+            return False
+        if key:
+            self._store_compile_cache(key, output)
+        self.odin_binary = output
+        return True
+
+    def compile_rust_benchmark(self):
+        self.create_cargo_toml()
+        try:
+            key = self._compile_cache_key(
+                self.rust_source,
+                self.benchmark_dir / "Cargo.toml",
+                self._toolchain_version(["cargo", "--version"]),
+            )
+        except OSError:
+            # Source unreadable; let the build report it instead.
+            key = None
+        cached = self._cached_binary(key) if key else None
+        if cached is not None:
+            print("Rust benchmark binary up to date, skipping build")
+            self.rust_binary = cached
+            return True
+        env = {**os.environ, "CARGO_TARGET_DIR": str(self.cargo_target_dir)}
+        sccache = shutil.which("sccache")
+        if sccache:
+            env["RUSTC_WRAPPER"] = sccache
+        result = self.run_command(
+            ["cargo", "build", "--release"],
+            timeout=self._cargo_build_timeout,
+            env=env,
+        )
+        if result.returncode != 0:
+            print("Rust benchmark build failed:")
+            print(result.stderr)
+            return False
+        src_binary = (
+            self.cargo_target_dir / "release" / f"re2_performance_comparison{_EXE}"
+        )
+        dst_binary = self.benchmark_dir / f"re2_rust_benchmark{_EXE}"
+        if src_binary.exists():
+            dst_binary.unlink(missing_ok=True)
+            try:
+                os.link(src_binary, dst_binary)
+            except OSError:
+                # Cross-device or unsupported filesystem; fall back to a copy.
+                shutil.copy2(src_binary, dst_binary)
+            if key:
+                self._store_compile_cache(key, dst_binary)
+            self.rust_binary = dst_binary
+        return True
+
+    def run_odin_benchmark(self):
+        binary = self.odin_binary
+        if binary is None:
+            name = f"re2_odin_benchmark{_EXE}"
+            if name in _dir_files(self.benchmark_dir):
+                binary = self.benchmark_dir / name
+            elif name in _dir_files(self.results_dir):
+                binary = self.results_dir / name
+        if binary is None:
+            print("Odin benchmark binary not found")
+            return None
+        output_file = self.results_dir / f"odin_benchmark_{self.run_id}.txt"
+        result = self.run_command(
+            [str(binary)], stdout_path=output_file, timeout=self._benchmark_timeout
+        )
+        if result.returncode != 0:
+            with output_file.open("a", encoding="utf-8") as f:
+                f.writelines(("\n\nSTDERR:\n", result.stderr))
+            print("Odin benchmark run failed:")
+            print(result.stderr)
+            return None
+        # Parse before appending the trailer so the mapped view only covers
+        # the benchmark's own stdout.
+        if output_file.stat().st_size:
+            with output_file.open("rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    parsed = self.parse_odin_output(mapped)
+        else:
+            parsed = []
+        with output_file.open("a", encoding="utf-8") as f:
+            f.writelines(("\n\nSTDERR:\n", result.stderr))
+        return parsed
+
+    def run_rust_benchmark(self):
+        binary = self.rust_binary
+        if binary is None:
+            release_dir = self.cargo_target_dir / "release"
+            if f"re2_rust_benchmark{_EXE}" in _dir_files(self.benchmark_dir):
+                binary = self.benchmark_dir / f"re2_rust_benchmark{_EXE}"
+            elif f"re2_performance_comparison{_EXE}" in _dir_files(release_dir):
+                binary = release_dir / f"re2_performance_comparison{_EXE}"
+        if binary is None:
+            print("Rust benchmark binary not found")
+            return None
+        output_file = self.results_dir / f"rust_benchmark_{self.run_id}.txt"
+        result = self.run_command(
+            [str(binary)], stdout_path=output_file, timeout=self._benchmark_timeout
+        )
+        with output_file.open("a", encoding="utf-8") as f:
+            f.writelines(("\n\nSTDERR:\n", result.stderr))
+        if result.returncode != 0:
+            print("Rust benchmark run failed:")
+            print(result.stderr)
+            return None
+        json_file = self.results_dir / f"rust_benchmark_{self.run_id}.json"
+        potential_json = self.benchmark_dir / "rust_benchmark_results.json"
+        if potential_json.exists():
+            shutil.move(potential_json, json_file)
+        if not json_file.exists():
+            print("Rust benchmark produced no JSON results")
+            return None
+        # orjson (when installed) parses large result payloads several times
+        # faster than stdlib json; loads-on-bytes works for either module.
+        return _json.loads(json_file.read_bytes())
+
+    def parse_odin_output(self, output):
+        """Parse benchmark log text; accepts str or any bytes-like (e.g. mmap)."""
+        if isinstance(output, str):
+            output = output.encode("utf-8")
+        results = []
+        current_test = {}
+        for match in _PARSE_RE.finditer(output):
+            key = match.group(1).decode("ascii")
+            value = match.group(2).decode("utf-8", "replace")
+            if key == "Test":
+                if current_test:
+                    results.append(current_test)
+                current_test = {"name": value}
+            else:
+                current_test[_FIELD_MAP[key]] = value
+        if current_test:
+            results.append(current_test)
+        return results
+
+    def compare_results(self, odin_results, rust_results):
+        comparison = {}
+        rust_by_name = {entry.get("name"): entry for entry in rust_results}
+        for odin_entry in odin_results:
+            name = odin_entry.get("name")
+            comparison[name] = {
+                "odin": odin_entry,
+                "rust": rust_by_name.get(name),
+            }
+        return comparison
+
+    def summarize_throughput(self, comparison):
+        """Per-engine throughput mean/pstdev, computed with stdlib statistics.
+
+        The dataset is a few hundred rows at most, so defaultdict grouping
+        plus statistics.mean/pstdev covers it without pulling in pandas.
+        """
+        groups = defaultdict(list)
+        for entry in comparison.values():
+            odin_entry = entry["odin"] or {}
+            rust_entry = entry["rust"] or {}
+            throughput = odin_entry.get("throughput")
+            if throughput:
+                try:
+                    groups["odin"].append(float(throughput.split()[0]))
+                except ValueError:
+                    pass
+            throughput = rust_entry.get("throughput_mb_s")
+            if isinstance(throughput, (int, float)):
+                groups["rust"].append(float(throughput))
+        return {
+            side: {"mean": mean(values), "stdev": pstdev(values)}
+            for side, values in groups.items()
+            if values
+        }
+
+    def generate_report(self, odin_results, rust_results, comparison):
+        lines = []
+        for name, entry in comparison.items():
+            odin_entry = entry["odin"] or {}
+            rust_entry = entry["rust"] or {}
+            lines.append(
+                f"| {name} | {odin_entry.get('compile_time', '-')} "
+                f"| {odin_entry.get('match_time', '-')} "
+                f"| {odin_entry.get('throughput', '-')} "
+                f"| {rust_entry.get('throughput_mb_s', '-')} |"
+            )
+        summary = self.summarize_throughput(comparison)
+        odin_tp = summary.get("odin", {"mean": 0.0, "stdev": 0.0})
+        rust_tp = summary.get("rust", {"mean": 0.0, "stdev": 0.0})
+        report = _REPORT_TEMPLATE.format_map(
+            {
+                "run_human": self.run_human,
+                "platform": sys.platform,
+                "py_version": sys.version.split()[0],
+                "odin_count": len(odin_results),
+                "rust_count": len(rust_results),
+                "compared": len(comparison),
+                "odin_tp_mean": odin_tp["mean"],
+                "odin_tp_stdev": odin_tp["stdev"],
+                "rust_tp_mean": rust_tp["mean"],
+                "rust_tp_stdev": rust_tp["stdev"],
+                "rows": "\n".join(lines),
+            }
+        )
+        report_file = self.results_dir / f"comparison_report_{self.run_id}.md"
+        report_file.write_text(report, encoding="utf-8")
+        print(f"Report written: {report_file}")
+        return report_file
+
+    def run_full_comparison(self, parallel_run=False):
+        # The two toolchains compile independent sources; overlap them.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            compile_futures = {
+                executor.submit(self.compile_odin_benchmark): "odin",
+                executor.submit(self.compile_rust_benchmark): "rust",
+            }
+            for future in as_completed(compile_futures):
+                if not future.result():
+                    print(f"{compile_futures[future]} compilation failed, aborting")
+                    return False
+
+        if parallel_run:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                odin_future = executor.submit(self.run_odin_benchmark)
+                rust_future = executor.submit(self.run_rust_benchmark)
+                odin_results = odin_future.result()
+                rust_results = rust_future.result()
+        else:
+            odin_results = self.run_odin_benchmark()
+            rust_results = self.run_rust_benchmark()
+
+        if odin_results is None or rust_results is None:
+            print("Benchmark execution failed, no report generated")
+            return False
+
+        comparison = self.compare_results(odin_results, rust_results)
+        self.generate_report(odin_results, rust_results, comparison)
+        return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--parallel-run",
+        action="store_true",
+        help="run the two benchmark executables concurrently "
+        "(they will share CPU caches; keep serial for clean numbers)",
+    )
+    args = parser.parse_args()
+    runner = BenchmarkRunner()
+    return 0 if runner.run_full_comparison(parallel_run=args.parallel_run) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""Compare Odin RE2 runner results against the Rust regex reference.
+
+Drives the four comparison runners (functionality and performance, for both
+the Odin engine and the Rust reference implementation), loads the TSV result
+files they emit, and writes markdown comparison reports under
+comparison/reports/.
+
+Usage:
+    python scripts/compare_re2_results.py            # full run
+    python scripts/compare_re2_results.py --skip-exec  # reuse existing TSVs
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import functools
+import hashlib
+import pickle
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from math import inf, isfinite, isinf
+from pathlib import Path
+from statistics import StatisticsError, fmean
+
+import polars as pl
+
+_INF = inf
+
+_ODIN = shutil.which("odin") or "odin"
+_CARGO = shutil.which("cargo") or "cargo"
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPARISON_DIR = ROOT / "comparison"
+RESULTS_DIR = COMPARISON_DIR / "results"
+REPORTS_DIR = COMPARISON_DIR / "reports"
+BIN_DIR = COMPARISON_DIR / "bin"
+
+FUNC_ODIN_RUNNER = COMPARISON_DIR / "functionality_runner.odin"
+PERF_ODIN_RUNNER = COMPARISON_DIR / "performance_runner.odin"
+RUST_RUNNER_DIR = COMPARISON_DIR / "rust_reference"
+
+_FUNC_BOOL_COLS = (
+    "compile_ok",
+    "should_compile",
+    "actual_match",
+    "expected_match",
+    "match_verified",
+    "verify_full_match",
+)
+
+_FUNC_SCHEMA = {
+    "name": pl.Utf8,
+    "status": pl.Utf8,
+    "compile_ok": pl.Utf8,
+    "should_compile": pl.Utf8,
+    "actual_match": pl.Utf8,
+    "expected_match": pl.Utf8,
+    "match_verified": pl.Utf8,
+    "verify_full_match": pl.Utf8,
+    "compile_ns": pl.Int64,
+    "match_ns": pl.Int64,
+    "notes": pl.Utf8,
+}
+
+_PERF_SCHEMA = {
+    "name": pl.Utf8,
+    "text_size": pl.Int64,
+    "iterations": pl.Int64,
+    "avg_ns": pl.Int64,
+    "throughput_mb_s": pl.Float64,
+    "status": pl.Utf8,
+    "notes": pl.Utf8,
+}
+
+
+_MISMATCH_ROW_FMT = (
+    "| {name} | {o_status} | {r_status} | {o_match} | {r_match} | {o_notes} | {r_notes} |"
+)
+
+_MISMATCH_TABLE_HEADER = (
+    b"## Mismatches\n"
+    b"\n"
+    b"| Case | Odin status | Rust status | Odin match | Rust match | Odin notes | Rust notes |\n"
+    b"|------|-------------|-------------|------------|------------|------------|------------|\n"
+)
+
+_PERF_TABLE_HEADER = (
+    b"## Detailed Results\n"
+    b"\n"
+    b"| Scenario | Text size | Iterations | Odin avg (ns) | Rust avg (ns) "
+    b"| Odin MB/s | Rust MB/s | Ratio | Status | Notes |\n"
+    b"|----------|-----------|------------|---------------|---------------"
+    b"|-----------|-----------|-------|--------|-------|\n"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class CaseRecord:
+    name: str
+    status: str
+    compile_ok: bool
+    should_compile: bool
+    actual_match: bool
+    expected_match: bool
+    match_verified: bool
+    verify_full_match: bool
+    compile_ns: int
+    match_ns: int
+    notes: str
+
+
+@dataclass(slots=True, frozen=True)
+class PerfRecord:
+    name: str
+    text_size: int
+    iterations: int
+    avg_ns: int
+    throughput_mb_s: float
+    status: str
+    notes: str
+
+
+@dataclass(slots=True, frozen=True)
+class PerfComparisonRow:
+    name: str
+    text_size: int
+    iterations: int
+    odin_avg_ns: int
+    rust_avg_ns: int
+    odin_throughput: float
+    rust_throughput: float
+    throughput_ratio: float
+    status_odin: str
+    status_rust: str
+    notes_odin: str
+    notes_rust: str
+
+
+def load_functionality_tsv(path: Path) -> dict[str, CaseRecord]:
+    """Load a functionality-runner TSV into a name-keyed dict of records."""
+    df = pl.read_csv(
+        path,
+        separator="\t",
+        schema_overrides=_FUNC_SCHEMA,
+        null_values=[""],
+    ).with_columns(
+        [
+            pl.col(col).str.to_lowercase().is_in(["true", "1", "yes"]).alias(col)
+            for col in _FUNC_BOOL_COLS
+        ]
+        + [pl.col("notes").fill_null("")]
+    )
+    records: dict[str, CaseRecord] = {}
+    for row in df.iter_rows(named=True):
+        records[row["name"]] = CaseRecord(**row)
+    return records
+
+
+def load_performance_tsv(path: Path) -> dict[str, PerfRecord]:
+    """Load a performance-runner TSV into a name-keyed dict of records."""
+    df = pl.read_csv(
+        path,
+        separator="\t",
+        schema_overrides=_PERF_SCHEMA,
+        null_values=[""],
+    ).with_columns(
+        pl.col("throughput_mb_s").fill_null(0.0),
+        pl.col("notes").fill_null(""),
+    )
+    records: dict[str, PerfRecord] = {}
+    for row in df.iter_rows(named=True):
+        records[row["name"]] = PerfRecord(**row)
+    return records
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cached(path: Path, loader):
+    """Memoize a TSV loader via a pickle sidecar keyed on (mtime_ns, size).
+
+    The sidecar lives next to the TSV as <name>.tsv.pkl and is rewritten
+    whenever the TSV changes, so repeated --skip-exec runs skip parsing.
+    """
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = path.with_suffix(path.suffix + ".pkl")
+    if cache_path.exists():
+        try:
+            with cache_path.open("rb") as fh:
+                cached_key, records = pickle.load(fh)
+            if cached_key == key:
+                return records
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+    records = loader(path)
+    with cache_path.open("wb") as fh:
+        pickle.dump((key, records), fh, protocol=pickle.HIGHEST_PROTOCOL)
+    return records
+
+
+_PIPE_ESCAPE = str.maketrans({"|": "\\|"})
+
+
+def escape_pipe(value: str) -> str:
+    """Escape markdown table delimiters inside a cell."""
+    return value.translate(_PIPE_ESCAPE)
+
+
+def format_ratio(value: float) -> str:
+    if isfinite(value):
+        return f"{value:.2f}"
+    return "inf" if isinf(value) else "n/a"
+
+
+def average(values) -> float:
+    """Mean of the positive values, in one pass and O(1) extra memory."""
+    total = 0.0
+    count = 0
+    for value in values:
+        if value > 0.0:
+            total += value
+            count += 1
+    return total / count if count else 0.0
+
+
+def records_align(odin: CaseRecord, rust: CaseRecord) -> bool:
+    """Whether both engines agree on the observable outcome of a case."""
+    if (odin.status, odin.compile_ok, odin.actual_match) != (
+        rust.status,
+        rust.compile_ok,
+        rust.actual_match,
+    ):
+        return False
+    if odin.verify_full_match and rust.verify_full_match:
+        return odin.match_verified == rust.match_verified
+    return True
+
+
+def _iter_aligned(odin_records, rust_records):
+    """Yield (key, odin, rust) pairs, with None standing in for a missing side.
+
+    Both loaders insert records in TSV order, so when the key sequences
+    already match we walk the two dicts in lockstep without any hashing or
+    sorting. Otherwise split the keys once with C-level set algebra on the
+    dict key views and index the common keys directly.
+    """
+    if list(odin_records) == list(rust_records):
+        for (key, odin), (_, rust) in zip(odin_records.items(), rust_records.items()):
+            yield key, odin, rust
+        return
+    odin_keys = odin_records.keys()
+    rust_keys = rust_records.keys()
+    for key in sorted(odin_keys & rust_keys):
+        yield key, odin_records[key], rust_records[key]
+    for key in sorted(odin_keys - rust_keys):
+        yield key, odin_records[key], None
+    for key in sorted(rust_keys - odin_keys):
+        yield key, None, rust_records[key]
+
+
+def compare_functionality_records(odin_records, rust_records):
+    matched = []
+    mismatched = []
+    missing = []
+    for key, odin, rust in _iter_aligned(odin_records, rust_records):
+        if odin is None or rust is None:
+            missing.append(key)
+            continue
+        if records_align(odin, rust):
+            matched.append(key)
+        else:
+            mismatched.append((key, odin, rust))
+    return matched, mismatched, missing
+
+
+def compare_performance_records(odin_records, rust_records):
+    rows = []
+    missing = []
+    for key, odin, rust in _iter_aligned(odin_records, rust_records):
+        if odin is None or rust is None:
+            missing.append(key)
+            continue
+        odin_tp = odin.throughput_mb_s
+        rust_tp = rust.throughput_mb_s
+        ratio = (odin_tp / rust_tp) if rust_tp > 0.0 else (_INF if odin_tp > 0.0 else 0.0)
+        rows.append(
+            PerfComparisonRow(
+                name=key,
+                text_size=odin.text_size,
+                iterations=odin.iterations,
+                odin_avg_ns=odin.avg_ns,
+                rust_avg_ns=rust.avg_ns,
+                odin_throughput=odin.throughput_mb_s,
+                rust_throughput=rust.throughput_mb_s,
+                throughput_ratio=ratio,
+                status_odin=odin.status,
+                status_rust=rust.status,
+                notes_odin=odin.notes,
+                notes_rust=rust.notes,
+            )
+        )
+    return rows, missing
+
+
+def write_functionality_report(matched, mismatched, missing, output_path: Path, timestamp: str) -> None:
+    total = len(matched) + len(mismatched)
+    header = (
+        "# Functionality Comparison: Odin RE2 vs Rust regex\n"
+        "\n"
+        f"Generated: {timestamp}\n"
+        "\n"
+        "## Summary\n"
+        "\n"
+        "| Metric | Value |\n"
+        "|--------|-------|\n"
+        f"| Cases compared | {total} |\n"
+        f"| Aligned | {len(matched)} |\n"
+        f"| Mismatched | {len(mismatched)} |\n"
+        f"| Missing on one side | {len(missing)} |\n"
+        "\n"
+    )
+    with output_path.open("wb", buffering=1 << 20) as fh:
+        fh.write(header.encode("utf-8"))
+        if mismatched:
+            fh.write(_MISMATCH_TABLE_HEADER)
+            for key, odin, rust in mismatched:
+                row = _MISMATCH_ROW_FMT.format(
+                    name=escape_pipe(key),
+                    o_status=odin.status,
+                    r_status=rust.status,
+                    o_match=odin.actual_match,
+                    r_match=rust.actual_match,
+                    o_notes=escape_pipe(odin.notes or "-"),
+                    r_notes=escape_pipe(rust.notes or "-"),
+                )
+                fh.write(row.encode("utf-8"))
+                fh.write(b"\n")
+            fh.write(b"\n")
+        if missing:
+            fh.write(b"## Missing Cases\n\n")
+            for key in missing:
+                fh.write(f"- {escape_pipe(key)}\n".encode("utf-8"))
+            fh.write(b"\n")
+
+
+def _perf_row(row: PerfComparisonRow) -> str:
+    """Format one detailed-results row; f-strings skip str.format's template parse."""
+    return (
+        f"| {escape_pipe(row.name)} | {row.text_size} | {row.iterations} "
+        f"| {row.odin_avg_ns} | {row.rust_avg_ns} "
+        f"| {row.odin_throughput:.2f} | {row.rust_throughput:.2f} "
+        f"| {format_ratio(row.throughput_ratio)} | {row.status_odin}/{row.status_rust} "
+        f"| Odin: {escape_pipe(row.notes_odin or '-')} / Rust: {escape_pipe(row.notes_rust or '-')} |"
+    )
+
+
+def write_performance_report(rows, missing, output_path: Path, timestamp: str) -> None:
+    odin_avg = average(row.odin_throughput for row in rows)
+    rust_avg = average(row.rust_throughput for row in rows)
+    _isfinite = isfinite
+    try:
+        ratio_avg = fmean(
+            row.throughput_ratio for row in rows if _isfinite(row.throughput_ratio)
+        )
+    except StatisticsError:
+        ratio_avg = 0.0
+    header = (
+        "# Performance Comparison: Odin RE2 vs Rust regex\n"
+        "\n"
+        f"Generated: {timestamp}\n"
+        "\n"
+        "## Summary\n"
+        "\n"
+        "| Metric | Value |\n"
+        "|--------|-------|\n"
+        f"| Scenarios compared | {len(rows)} |\n"
+        f"| Odin avg throughput (MB/s) | {odin_avg:.2f} |\n"
+        f"| Rust avg throughput (MB/s) | {rust_avg:.2f} |\n"
+        f"| Avg throughput ratio (Odin/Rust) | {format_ratio(ratio_avg)} |\n"
+        "\n"
+    )
+    with output_path.open("wb", buffering=1 << 20) as fh:
+        fh.write(header.encode("utf-8"))
+        fh.write(_PERF_TABLE_HEADER)
+        for row in rows:
+            fh.write(_perf_row(row).encode("utf-8"))
+            fh.write(b"\n")
+        fh.write(b"\n")
+        if missing:
+            fh.write(b"## Missing Scenarios\n\n")
+            for key in missing:
+                fh.write(f"- {escape_pipe(key)}\n".encode("utf-8"))
+            fh.write(b"\n")
+
+
+def _odin_runner_binary(runner: Path) -> Path:
+    """Cached-binary path for a runner, keyed on its dependency closure.
+
+    The hash covers the newest mtime across the runner source and the engine
+    sources it imports, so any edit produces a fresh binary name and stale
+    binaries are simply never executed again.
+    """
+    sources = [runner, *(ROOT / "core").glob("*.odin"), *(ROOT / "src").glob("*.odin")]
+    source_mtime = max(path.stat().st_mtime_ns for path in sources)
+    digest = hashlib.blake2b(
+        f"{runner.name}:{source_mtime}".encode(), digest_size=8
+    ).hexdigest()
+    return BIN_DIR / f"{runner.stem}_{digest}"
+
+
+async def _run_job(cmd, cwd: Path, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        print(f"Running: {' '.join(str(part) for part in cmd)}")
+        # close_fds=False keeps the posix_spawn fast path; the script holds no
+        # stray inheritable fds beyond the std streams.
+        proc = await asyncio.create_subprocess_exec(
+            *(str(part) for part in cmd), cwd=cwd, close_fds=False
+        )
+        returncode = await proc.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+
+async def _run_jobs(jobs, max_jobs: int) -> None:
+    """Run (cmd, cwd) jobs concurrently, cancelling the rest on first failure."""
+    sem = asyncio.Semaphore(max(1, max_jobs))
+    tasks = [asyncio.create_task(_run_job(cmd, cwd, sem)) for cmd, cwd in jobs]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--skip-exec",
+        action="store_true",
+        help="reuse existing TSV results instead of re-running the runners",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="how many runners to execute concurrently (1 to bisect serially)",
+    )
+    args = parser.parse_args()
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    BIN_DIR.mkdir(parents=True, exist_ok=True)
+
+    func_odin_output = RESULTS_DIR / "functionality_odin.tsv"
+    func_rust_output = RESULTS_DIR / "functionality_rust.tsv"
+    perf_odin_output = RESULTS_DIR / "performance_odin.tsv"
+    perf_rust_output = RESULTS_DIR / "performance_rust.tsv"
+
+    if not args.skip_exec:
+        func_bin = _odin_runner_binary(FUNC_ODIN_RUNNER)
+        perf_bin = _odin_runner_binary(PERF_ODIN_RUNNER)
+        build_jobs = []
+        if not func_bin.exists():
+            build_jobs.append(
+                (
+                    [
+                        _ODIN, "build", str(FUNC_ODIN_RUNNER), "-file",
+                        "-o:speed", f"-out:{func_bin}",
+                    ],
+                    ROOT,
+                )
+            )
+        if not perf_bin.exists():
+            build_jobs.append(
+                (
+                    [
+                        _ODIN, "build", str(PERF_ODIN_RUNNER), "-file",
+                        "-o:speed", f"-out:{perf_bin}",
+                    ],
+                    ROOT,
+                )
+            )
+        build_jobs.append(([_CARGO, "build", "--release"], RUST_RUNNER_DIR))
+        asyncio.run(_run_jobs(build_jobs, args.jobs))
+
+        rust_release = RUST_RUNNER_DIR / "target" / "release"
+        run_jobs = [
+            ([func_bin, "-out-tsv", func_odin_output], ROOT),
+            ([perf_bin, "-out-tsv", perf_odin_output], ROOT),
+            (
+                [rust_release / "functionality", "--out-tsv", func_rust_output],
+                RUST_RUNNER_DIR,
+            ),
+            (
+                [rust_release / "performance", "--out-tsv", perf_rust_output],
+                RUST_RUNNER_DIR,
+            ),
+        ]
+        asyncio.run(_run_jobs(run_jobs, args.jobs))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        func_odin_future = executor.submit(_load_cached, func_odin_output, load_functionality_tsv)
+        func_rust_future = executor.submit(_load_cached, func_rust_output, load_functionality_tsv)
+        perf_odin_future = executor.submit(_load_cached, perf_odin_output, load_performance_tsv)
+        perf_rust_future = executor.submit(_load_cached, perf_rust_output, load_performance_tsv)
+        odin_func_records = func_odin_future.result()
+        rust_func_records = func_rust_future.result()
+        odin_perf_records = perf_odin_future.result()
+        rust_perf_records = perf_rust_future.result()
+
+    matched, mismatched, missing_func = compare_functionality_records(
+        odin_func_records, rust_func_records
+    )
+    perf_rows, missing_perf = compare_performance_records(
+        odin_perf_records, rust_perf_records
+    )
+
+    report_ts = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    func_report = REPORTS_DIR / "functionality_comparison.md"
+    perf_report = REPORTS_DIR / "performance_comparison.md"
+    write_functionality_report(matched, mismatched, missing_func, func_report, report_ts)
+    write_performance_report(perf_rows, missing_perf, perf_report, report_ts)
+
+    print(f"Functionality report: {func_report}")
+    print(f"Performance report: {perf_report}")
+    return 0 if not mismatched else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())